@@ -2,4 +2,6 @@
 import uvicorn
 
 if __name__ == "__main__":
+    # loop/http default to "auto": uvloop + httptools when installed (uvicorn[standard]),
+    # falling back to asyncio + h11 (e.g. on Windows, where uvloop is unavailable).
     uvicorn.run("prompt_gen.api.api:app", host="0.0.0.0", port=8000, reload=True)
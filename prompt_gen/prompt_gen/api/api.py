@@ -1,14 +1,30 @@
 # src/prompt_gen/api/api.py
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import FastAPI
+from ..cache import response_cache
 from .routers import prompt
 # from ..services.prompt_service import init_db  # Optional, if you have a DB
 
 app = FastAPI()
 
+# kickoff_async runs each crew in the loop's default executor, which asyncio sizes
+# at min(32, cpu + 4) threads; a crew holds its thread for the whole run (mostly
+# waiting on the LLM), so that would cap concurrent requests per worker.
+CREW_THREADS = int(os.getenv("PROMPT_GEN_CREW_THREADS", "64"))
+
 @app.on_event("startup")
-def on_startup():
+async def on_startup():
     # init_db()  # e.g. if you have a DB to initialize
-    pass
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=CREW_THREADS, thread_name_prefix="crew"))
+    # Load the optional embedding model here rather than on the first request.
+    await loop.run_in_executor(None, response_cache.load_model)
 
 # Include the router for our “prompt-gen” endpoints
 app.include_router(prompt.router, prefix="/prompt-gen", tags=["prompt-gen"])
+
+# Unvalidated fast-path routes, for deployments behind a validating gateway only
+if os.getenv("PROMPT_GEN_TRUSTED_ROUTES", "0") == "1":
+    app.include_router(prompt.trusted_router, prefix="/prompt-gen", tags=["prompt-gen"])
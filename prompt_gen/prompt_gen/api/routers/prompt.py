@@ -1,31 +1,45 @@
 # src/prompt_gen/api/routers/prompt.py
-import json
-from fastapi import APIRouter, HTTPException
-from ...schemas import PromptGenInput
-from ...crew import PromptGenCrew
+import asyncio
+from typing import Any, Dict
+import orjson
+from fastapi import APIRouter, Body, HTTPException
+from fastapi.responses import StreamingResponse
+from ...schemas import PromptGenConfig, PromptGenInput, PromptGenResponse
+from ...crew import pooled_crew
+from ...llm import stream_sink
+from ..streaming import FinalPromptExtractor
 
 router = APIRouter()
+# Routes that skip request validation; only mounted when PROMPT_GEN_TRUSTED_ROUTES=1 (see api.py).
+trusted_router = APIRouter()
 
-@router.post("/create_prompt")
-def create_prompt(input: PromptGenInput):
-    """
-    Takes user’s prompt-generation requirements, runs the PromptGenCrew,
-    and returns the final prompt.
-    """
-    crew_instance = PromptGenCrew()
-    result = crew_instance.crew().kickoff(inputs=input.dict())
+_REQUIRED_INPUT_FIELDS = [
+    name for name, field in PromptGenInput.model_fields.items() if field.is_required()
+]
+_TRUSTED_STR_FIELDS = ("problem_statement", "domain", "output_context")
 
-    # Try CrewAI’s parsed JSON first:
-    final_data = result.json_dict
 
-    if not final_data:
-        # If that failed, fallback to manual parsing of the raw text:
+async def _run_crew(input: PromptGenInput):
+    with pooled_crew() as crew_instance:
+        return await crew_instance.crew().kickoff_async(inputs=input.model_dump())
+
+
+def _final_payload(result) -> Dict[str, Any]:
+    """
+    Turns the crew result into the response body, raising HTTPException
+    when the final output has no usable 'final_prompt'.
+    """
+    # The final task has output_pydantic=PromptGenConfig; use the validated model:
+    if isinstance(result.pydantic, PromptGenConfig):
+        final_data = result.pydantic.model_dump()
+    else:
+        # CrewAI could not convert the answer; fallback to manual parsing of the raw text:
         raw_output = result.raw or ""
         try:
-            final_data = json.loads(raw_output)
-        except json.JSONDecodeError as e:
+            final_data = orjson.loads(raw_output)
+        except orjson.JSONDecodeError as e:
             raise HTTPException(
-                status_code=500, 
+                status_code=500,
                 detail=f"Agent returned non-JSON output. Raw response was:\n{raw_output}"
             )
 
@@ -39,5 +53,93 @@ def create_prompt(input: PromptGenInput):
     return {
         "status": "success",
         "final_prompt": final_prompt,
-        "notes": final_data.get("notes", [])
+        "notes": final_data.get("notes") or []
     }
+
+
+@router.post("/create_prompt", response_model=PromptGenResponse)
+async def create_prompt(input: PromptGenInput):
+    """
+    Takes user’s prompt-generation requirements, runs the PromptGenCrew,
+    and returns the final prompt.
+
+    The crew runs via kickoff_async (in a worker thread), so the event loop
+    keeps serving other requests while the LLM calls are in flight.
+    """
+    result = await _run_crew(input)
+    return _final_payload(result)
+
+
+@trusted_router.post("/create_prompt/trusted", response_model=PromptGenResponse)
+async def create_prompt_trusted(raw: Dict[str, Any] = Body(...)):
+    """
+    /create_prompt for trusted internal callers whose payloads were already
+    validated upstream (e.g. at the API gateway): only checks required fields
+    are present and have the expected types (422 otherwise), and builds
+    PromptGenInput with model_construct (no validation).
+    """
+    missing = [name for name in _REQUIRED_INPUT_FIELDS if raw.get(name) is None]
+    if missing:
+        raise HTTPException(status_code=422, detail=f"Missing required fields: {missing}")
+    # Type checks only, for the values the crew uses as strings (no coercion).
+    not_str = [name for name in _TRUSTED_STR_FIELDS if not isinstance(raw[name], str)]
+    if raw.get("output_schema") is not None and not isinstance(raw["output_schema"], str):
+        not_str.append("output_schema")
+    if not_str:
+        raise HTTPException(status_code=422, detail=f"Fields must be strings: {not_str}")
+    placeholders = raw["input_placeholders"]
+    if not isinstance(placeholders, list) or not all(isinstance(item, str) for item in placeholders):
+        raise HTTPException(status_code=422, detail="'input_placeholders' must be a list of strings.")
+
+    result = await _run_crew(PromptGenInput.model_construct(**raw))
+    return _final_payload(result)
+
+
+@router.post("/create_prompt/stream")
+async def create_prompt_stream(input: PromptGenInput):
+    """
+    Same pipeline as /create_prompt, streamed as NDJSON:
+    - {"delta": "..."} lines carry 'final_prompt' text as the refinement step generates it;
+    - the last line is the /create_prompt response body, or {"status": "error", "detail": ...}.
+
+    If the refinement step is skipped (draft already valid), only the last line is sent.
+    """
+    loop = asyncio.get_running_loop()
+    deltas: asyncio.Queue = asyncio.Queue()
+
+    def sink(delta: str) -> None:
+        # Called from the crew's worker thread.
+        loop.call_soon_threadsafe(deltas.put_nowait, delta)
+
+    async def run_with_sink():
+        # Runs in its own task context, so the sink only applies to this request.
+        stream_sink.set(sink)
+        return await _run_crew(input)
+
+    async def events():
+        job = asyncio.create_task(run_with_sink())
+        job.add_done_callback(lambda _: deltas.put_nowait(None))
+        extractor = FinalPromptExtractor()
+
+        while (delta := await deltas.get()) is not None:
+            if extractor is None:
+                continue
+            try:
+                text = extractor.feed(delta)
+            except ValueError:
+                # Malformed escape in the streamed JSON: stop sending deltas;
+                # the final line still carries the validated payload.
+                extractor = None
+                continue
+            if text:
+                yield orjson.dumps({"delta": text}) + b"\n"
+
+        try:
+            payload = _final_payload(job.result())
+        except HTTPException as e:
+            payload = {"status": "error", "detail": e.detail}
+        except Exception as e:
+            payload = {"status": "error", "detail": str(e)}
+        yield orjson.dumps(payload) + b"\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
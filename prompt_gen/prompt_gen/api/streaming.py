@@ -0,0 +1,78 @@
+# src/prompt_gen/api/streaming.py
+import json
+import re
+
+_FINAL_PROMPT_KEY = re.compile(r'"final_prompt"\s*:\s*"')
+# Enough trailing text to hold a "final_prompt": key split across chunks.
+_KEY_LOOKBEHIND = 64
+
+
+class FinalPromptExtractor:
+    """
+    Incrementally pulls the "final_prompt" string value out of a streamed
+    JSON answer (which may be preceded by the agent's "Thought: ..." text).
+
+    feed() returns the newly decoded characters of the value, handling JSON
+    escapes that are split across chunks; it returns "" once the value ends.
+    Raises ValueError on a malformed escape (e.g. a non-hex \\uXXXX or an
+    unpaired surrogate, which could not be encoded as UTF-8).
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._in_value = False
+        self._done = False
+
+    def feed(self, chunk: str) -> str:
+        if self._done:
+            return ""
+        self._buffer += chunk
+
+        if not self._in_value:
+            match = _FINAL_PROMPT_KEY.search(self._buffer)
+            if not match:
+                self._buffer = self._buffer[-_KEY_LOOKBEHIND:]
+                return ""
+            self._buffer = self._buffer[match.end():]
+            self._in_value = True
+
+        buffer, decoded, i = self._buffer, [], 0
+        while i < len(buffer):
+            char = buffer[i]
+            if char == '"':
+                self._done = True
+                self._buffer = ""
+                return "".join(decoded)
+            if char != "\\":
+                decoded.append(char)
+                i += 1
+                continue
+
+            # Escape sequence: wait for the whole of it before decoding.
+            size = self._escape_size(buffer, i)
+            if size is None:
+                break
+            char = json.loads(f'"{buffer[i:i + size]}"')
+            if any(0xD800 <= ord(c) <= 0xDFFF for c in char):
+                raise ValueError(f"Unpaired surrogate escape: {buffer[i:i + size]!r}")
+            decoded.append(char)
+            i += size
+
+        self._buffer = buffer[i:]
+        return "".join(decoded)
+
+    @staticmethod
+    def _escape_size(buffer: str, i: int):
+        """
+        Length of the escape sequence starting at buffer[i], or None if incomplete.
+        """
+        if i + 1 >= len(buffer):
+            return None
+        if buffer[i + 1] != "u":
+            return 2
+        if i + 6 > len(buffer):
+            return None
+        # A high surrogate must be decoded together with the following \uXXXX.
+        if 0xD800 <= int(buffer[i + 2:i + 6], 16) <= 0xDBFF:
+            return 12 if i + 12 <= len(buffer) else None
+        return 6
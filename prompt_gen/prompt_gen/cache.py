@@ -0,0 +1,223 @@
+# src/prompt_gen/cache.py
+
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # optional: fall back to exact (normalized) matching
+    SentenceTransformer = None
+
+try:
+    import diskcache
+except ImportError:  # optional: only needed for the persistent tier
+    diskcache = None
+
+_WHITESPACE = re.compile(r"\s+")
+
+logger = logging.getLogger(__name__)
+
+# Part of every persistent key: bump it when cached answers stop being valid for
+# reasons the key cannot see (e.g. a change in how answers are produced or stored).
+CACHE_VERSION = "1"
+
+
+class ResponseCache:
+    """
+    Cache of agent answers for the interpretive (plan stage) tasks.
+
+    Entries are scoped (the interpolated agent role, which carries {domain}, plus
+    a fingerprint of the model and output schema; see crew._answer_scope) and
+    looked up by the rendered task prompt + context:
+      - exact match on the whitespace-normalized text, in process;
+      - exact match in a persistent diskcache under `directory` (sha256 of
+        CACHE_VERSION + key, `ttl` seconds), shared across workers and restarts,
+        when configured;
+      - embedding similarity >= `threshold` on the caller's `semantic_text` (the
+        per-request part of the prompt, not the static instructions), when given
+        and sentence-transformers is installed.
+
+    Concurrent requests for the same exact key are coalesced: the first one calls
+    the LLM, the others wait for its answer (up to `wait_timeout` seconds, see
+    `get_or_compute`).
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.97,
+        maxsize: int = 512,
+        model_name: str = "all-MiniLM-L6-v2",
+        directory: Optional[str] = None,
+        ttl: int = 86400,
+        wait_timeout: float = 180.0
+    ):
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.model_name = model_name
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self._disk = None
+        if directory:
+            if diskcache is None:
+                raise ImportError("A persistent response cache directory requires the 'diskcache' package.")
+            self._disk = diskcache.Cache(directory)
+        self._model = None
+        self._semantic_enabled = SentenceTransformer is not None
+        self._model_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._exact: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._vectors: Dict[str, List[Tuple[Any, Tuple[str, str]]]] = {}
+        self._inflight: Dict[Tuple[str, str], threading.Event] = {}
+        self._local = threading.local()
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return _WHITESPACE.sub(" ", text).strip()
+
+    @staticmethod
+    def _digest(key: Tuple[str, str]) -> str:
+        return hashlib.sha256("\0".join((CACHE_VERSION,) + key).encode("utf-8")).hexdigest()
+
+    def load_model(self) -> None:
+        """
+        Loads the embedding model once (called at startup, or lazily on first use).
+        If that fails (e.g. the model cannot be downloaded), the similarity tier is
+        disabled and lookups stay exact-only.
+        """
+        with self._model_lock:
+            if self._model is not None or not self._semantic_enabled:
+                return
+            try:
+                self._model = SentenceTransformer(self.model_name)
+            except Exception:
+                logger.warning("Could not load embedding model %r; semantic cache disabled.",
+                               self.model_name, exc_info=True)
+                self._semantic_enabled = False
+
+    def _embed(self, text: str):
+        if self._model is None:
+            self.load_model()
+        if self._model is None:
+            return None
+        return self._model.encode(text, normalize_embeddings=True)
+
+    def get(self, scope: str, text: str, semantic_text: Optional[str] = None) -> Optional[str]:
+        key = (scope, self._normalize(text))
+        with self._lock:
+            if key in self._exact:
+                self._exact.move_to_end(key)
+                return self._exact[key]
+            candidates = list(self._vectors.get(scope, []))
+
+        if self._disk is not None:
+            persisted = self._disk.get(self._digest(key))
+            if persisted is not None:
+                return persisted
+
+        if not candidates or not semantic_text:
+            return None
+
+        vector = self._embed(self._normalize(semantic_text))
+        if vector is None:
+            return None
+        score, best = max(((float(vector @ other), other_key) for other, other_key in candidates),
+                          key=lambda pair: pair[0])
+        if score < self.threshold:
+            return None
+        with self._lock:
+            return self._exact.get(best)
+
+    def set(self, scope: str, text: str, value: str, semantic_text: Optional[str] = None) -> None:
+        key = (scope, self._normalize(text))
+        vector = self._embed(self._normalize(semantic_text)) if semantic_text else None
+        if self._disk is not None:
+            self._disk.set(self._digest(key), value, expire=self.ttl)
+        with self._lock:
+            self._exact[key] = value
+            self._exact.move_to_end(key)
+            if vector is not None:
+                self._vectors.setdefault(scope, []).append((vector, key))
+            while len(self._exact) > self.maxsize:
+                evicted, _ = self._exact.popitem(last=False)
+                self._vectors[evicted[0]] = [
+                    entry for entry in self._vectors.get(evicted[0], []) if entry[1] != evicted
+                ]
+
+    def _computing(self) -> Set[Tuple[str, str]]:
+        """
+        Keys the current thread is computing right now.
+        """
+        if not hasattr(self._local, "keys"):
+            self._local.keys = set()
+        return self._local.keys
+
+    def _compute_and_store(
+        self,
+        key: Tuple[str, str],
+        text: str,
+        semantic_text: Optional[str],
+        compute: Callable[[], str],
+        validate: Optional[Callable[[str], bool]]
+    ) -> str:
+        computing = self._computing()
+        computing.add(key)
+        try:
+            value = compute()
+        finally:
+            computing.discard(key)
+        if validate is None or validate(value):
+            self.set(key[0], text, value, semantic_text)
+        return value
+
+    def get_or_compute(
+        self,
+        scope: str,
+        text: str,
+        compute: Callable[[], str],
+        semantic_text: Optional[str] = None,
+        validate: Optional[Callable[[str], bool]] = None
+    ) -> str:
+        """
+        Returns the cached answer, or computes and stores it. If another thread is
+        already computing the same key, waits for it instead of issuing a duplicate
+        LLM call (retries as the leader if that computation failed).
+
+        Re-entrant: CrewAI's Agent.execute_task retries by calling execute_task
+        again, so a call for a key this thread is already computing runs `compute`
+        directly. A waiter that times out computes the answer itself.
+
+        Answers for which `validate` returns False are returned but not stored
+        (waiters then compute their own).
+        """
+        key = (scope, self._normalize(text))
+        if key in self._computing():
+            return compute()
+
+        while True:
+            cached = self.get(scope, text, semantic_text)
+            if cached is not None:
+                return cached
+            with self._lock:
+                pending = self._inflight.get(key)
+                if pending is None:
+                    pending = self._inflight[key] = threading.Event()
+                    break
+            if not pending.wait(self.wait_timeout):
+                return self._compute_and_store(key, text, semantic_text, compute, validate)
+
+        try:
+            return self._compute_and_store(key, text, semantic_text, compute, validate)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            pending.set()
+
+
+# PROMPT_GEN_CACHE_DIR enables the persistent tier (e.g. a volume shared by all workers).
+response_cache = ResponseCache(directory=os.getenv("PROMPT_GEN_CACHE_DIR"))
+
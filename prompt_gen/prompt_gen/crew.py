@@ -1,10 +1,215 @@
 # src/prompt_gen/crew.py
 
-from typing import Any, Dict, List, Optional
-from pydantic import BaseModel
-from crewai import Agent, Crew, Process, Task, LLM
-from crewai.project import CrewBase, agent, task, crew, before_kickoff
-from .schemas import PromptGenConfig
+import hashlib
+import json
+import os
+import queue
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+from pydantic import BaseModel, Field, ValidationError
+from crewai import Agent, Crew, Process, Task
+from crewai.project import CrewBase, agent, task, crew, before_kickoff, after_kickoff
+from crewai.crews.crew_output import CrewOutput
+from crewai.tasks.conditional_task import ConditionalTask
+from crewai.tasks.task_output import TaskOutput
+from .schemas import DomainBreakdown, DraftPrompt, InputAnalysis, PromptGenConfig, SchemaInference
+from .llm import REQUEST_MARKER, shared_llm, stream_sink
+from .validation import decode_placeholders, draft_is_complete
+from .cache import response_cache
+
+# Inputs the task descriptions interpolate; missing / None ones are rendered as "".
+_TEMPLATE_INPUTS = ("problem_statement", "domain", "input_placeholders", "output_context", "output_schema")
+
+# Settings shared by every agent: single-shot JSON answers, no tools, no memory.
+_AGENT_DEFAULTS: Dict[str, Any] = dict(
+    memory=False,
+    verbose=False,
+    allow_delegation=False,
+    max_iter=1,
+    respect_context_window=True,
+    use_system_prompt=True,
+    cache=False,
+    max_retry_limit=2
+)
+
+
+def _compact_output(fields: Set[str]) -> Callable[[TaskOutput], None]:
+    """
+    Task callback that rewrites the output's raw text to minified JSON holding
+    only `fields`. Downstream tasks receive `raw` as their context, so this is
+    all they pay prefill for.
+    """
+    def compact(output: TaskOutput) -> None:
+        if output.pydantic is not None:
+            output.raw = output.pydantic.model_dump_json(include=fields)
+    return compact
+
+
+def _is_valid_output(task: Task, answer: str) -> bool:
+    """
+    Whether `answer` parses as the task's output_pydantic model: as a whole, or
+    the outermost {...} in it (e.g. inside a ```json fence).
+    """
+    if task.output_pydantic is None:
+        return True
+    candidates = [answer]
+    start, end = answer.find("{"), answer.rfind("}")
+    if 0 <= start < end:
+        candidates.append(answer[start:end + 1])
+    for candidate in candidates:
+        try:
+            task.output_pydantic.model_validate_json(candidate)
+            return True
+        except ValidationError:
+            pass
+    return False
+
+
+def _answer_scope(agent: Agent, task: Task) -> str:
+    """
+    Cache scope of an agent's answer: the role plus a fingerprint of what shapes
+    the answer besides the task prompt (model, goal, backstory and the
+    output_pydantic schema), so a deploy that changes any of them misses the
+    persistent tier instead of replaying answers built for the old setup.
+    """
+    schema = task.output_pydantic.model_json_schema() if task.output_pydantic else None
+    fingerprint = json.dumps(
+        [getattr(agent.llm, "model", str(agent.llm)), agent.goal, agent.backstory, schema],
+        sort_keys=True
+    )
+    return f"{agent.role}\0{hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()}"
+
+
+class CachedAgent(Agent):
+    """
+    Agent whose answers are served from `cache.response_cache` when an equivalent
+    task prompt (same `_answer_scope`, same rendered prompt + context) was already
+    answered, or is being answered for a concurrent request.
+    Only use it for tasks whose output is a pure function of their prompt.
+
+    Near-identical matching only compares the per-request values (the description
+    after REQUEST_MARKER), and is skipped for tasks that receive context (a
+    similar request with a different upstream answer is not the same question)
+    and for agents built with semantic_match=False.
+
+    Only answers that validate against the task's output_pydantic are stored:
+    CrewAI hands the raw answer on unchanged when conversion fails, and a refusal
+    or malformed answer must not be replayed to later requests.
+    """
+
+    semantic_match: bool = Field(
+        default=True,
+        description="Allow near-identical (embedding) matches; False for exact matches only."
+    )
+
+    def execute_task(self, task, context: Optional[str] = None, tools=None) -> str:
+        text = task.prompt() + ("\n" + context if context else "")
+        _, marker, request = task.description.partition(REQUEST_MARKER)
+        return response_cache.get_or_compute(
+            _answer_scope(self, task),
+            text,
+            lambda: super(CachedAgent, self).execute_task(task, context=context, tools=tools),
+            semantic_text=request if self.semantic_match and marker and not context else None,
+            validate=lambda answer: _is_valid_output(task, answer)
+        )
+
+
+# --------------------------------
+# Task descriptions
+# Built once at import and shared by every pooled crew; CrewAI interpolates the
+# {placeholders} per kickoff. Static instructions come first, per-request values
+# after the REQUEST_MARKER ("**REQUEST**:").
+# --------------------------------
+
+_DESC_DOMAIN_BREAKDOWN = r"""
+**INSTRUCTIONS**:
+1. Analyze the user's problem statement (given below), focusing on the domain-specific aspects.
+2. Identify any nuances or constraints that the domain imposes on this problem.
+3. Return JSON (format below) with:
+   - "domain_key_points": short lines about how the domain shapes the problem statement.
+   - "relevant_goals": derived or restated objectives from problem_statement in domain context.
+
+No extra commentary.
+
+**REQUEST**:
+Problem Statement: {problem_statement}
+Domain: {domain}
+"""
+
+_DESC_SCHEMA_INFERENCE = r"""
+**INSTRUCTIONS**:
+1. If the user-supplied 'output_schema' (given below) is specified and valid, confirm it as final_schema.
+2. If it's empty, propose one that fits the domain.
+3. Return JSON (format below) with:
+   - "final_schema": e.g. markdown or json.
+   - "schema_details": details on how to implement that schema (bullet points, headings, JSON keys, etc.).
+
+No extra commentary.
+
+**REQUEST**:
+Domain: {domain}
+User-supplied (or empty) 'output_schema': {output_schema}
+"""
+
+_DESC_INPUT_ANALYSIS = r"""
+We have the domain breakdown:
+{{output from domain_breakdown_task}}
+
+**INSTRUCTIONS**:
+1. Reflect on how each placeholder (already decoded into name/description below) or the
+   output context aligns with the domain breakdown. 
+   For example: "Placeholder <<features>> might describe product attributes, relevant in this domain because..."
+2. Return JSON (format below) with:
+   - "context_analysis": bullet points about how the output context fits the domain or the problem statement.
+
+No extra commentary outside the JSON.
+
+**REQUEST**:
+Domain: {domain}
+Decoded placeholders: {decoded_placeholders}
+Output Context: {output_context}
+"""
+
+_DESC_PROMPT_CONSTRUCTION = r"""
+We have:
+- Domain breakdown: {{output from domain_breakdown_task}}
+- Context analysis: {{output from input_analysis_task}}
+- Schema inference: {{output from schema_inference_task}}
+
+**INSTRUCTIONS**:
+1. Build a single prompt template text with:
+   - A header referencing the domain context or role (based on "domain_key_points" / "relevant_goals").
+   - A body describing how to use each placeholder from the decoded placeholders (below) in a meaningful way.
+   - A footer with explicit instructions about the "final_schema". This schema is mandatory.
+
+2. Return JSON (format below) with:
+   - "draftPrompt": the entire prompt template text.
+
+No commentary beyond JSON.
+
+**REQUEST**:
+Domain: {domain}
+Decoded placeholders: {decoded_placeholders}
+"""
+
+_DESC_PROMPT_REFINEMENT = r"""
+We have a draft prompt:
+{{output}}
+
+**INSTRUCTIONS**:
+1. Refine & finalize the prompt text. Keep placeholders intact (e.g. <<title>>).
+2. Ensure references to the domain remain consistent.
+3. The schema instructions must be mandatory (remove optional language if present).
+4. Return JSON (format below) with:
+   - "final_prompt": the refined final prompt text.
+   - "notes": a list of short notes on what changed (may be empty).
+
+No commentary or extra fields.
+
+**REQUEST**:
+Domain: {domain}
+"""
+
 
 @CrewBase
 class PromptGenCrew:
@@ -13,17 +218,29 @@ class PromptGenCrew:
 
     --- PLAN STAGE ---
     1) Domain Breakdown: Analyze the problem statement precisely in the context of {domain}.
-    2) Input Analysis: Understand placeholders and output context in light of the domain breakdown.
-    3) Schema Inference: Determine or confirm the final output schema.
+    2) Schema Inference: Determine or confirm the final output schema (runs concurrently with step 1).
+    3) Input Analysis: Understand placeholders and output context in light of the domain breakdown.
 
     --- EXECUTION STAGE ---
     4) Prompt Construction: Create a prompt template with a header (domain context), body (placeholders), and footer (mandatory schema).
     5) Prompt Refinement: Finalize the prompt template, ensuring placeholders & schema usage are mandatory.
+       Skipped when the draft already passes `draft_needs_refinement`.
     """
 
-    def __init__(self, llm_model: str = "openai/gpt-4"):
+    def __init__(
+        self,
+        llm_model: str = "openai/gpt-4",
+        cheap_llm_model: str = "openai/gpt-4o-mini"
+    ):
         self.llm_model = llm_model
-        self.llm = LLM(model=self.llm_model, temperature=0.2, verbose=False)
+        self.cheap_llm_model = cheap_llm_model
+        # Model tiering: the reasoning-heavy steps (domain breakdown, prompt construction)
+        # use `llm`; schema inference, input analysis and refinement use `cheap_llm`.
+        self.llm = shared_llm(self.llm_model, temperature=0.2)
+        self.cheap_llm = shared_llm(self.cheap_llm_model, temperature=0.2)
+        # Same model as cheap_llm, but streams to `llm.stream_sink`; the refinement
+        # agent switches to it per request, only when a sink is set (see capture_inputs).
+        self.stream_llm = shared_llm(self.cheap_llm_model, temperature=0.2, streaming=True)
         self.inputs: Dict[str, Any] = {}
 
     # --------------------------------
@@ -34,17 +251,58 @@ class PromptGenCrew:
         """
         This method captures top-level placeholders for CrewAI’s .format(**inputs).
         e.g. {problem_statement}, {domain}, etc.
+
+        Missing or None template inputs are filled with "" so interpolation never
+        raises KeyError (or renders "None"), and {decoded_placeholders} is added:
+        the placeholders split into name/description in Python, so no LLM step has to do it.
         """
+        inputs = {
+            **{key: "" for key in _TEMPLATE_INPUTS},
+            **{key: value for key, value in inputs.items() if value is not None}
+        }
+        decoded = decode_placeholders(inputs["input_placeholders"] or [])
+        inputs["decoded_placeholders"] = json.dumps(decoded, ensure_ascii=False)
         self.inputs = inputs
+        # Each pooled instance serves one request at a time, so the agent's LLM can be
+        # chosen per request (the executor picks it up when the task runs).
+        self.prompt_refinement_agent().llm = (
+            self.stream_llm if stream_sink.get() is not None else self.cheap_llm
+        )
         return inputs
 
+    # --------------------------------
+    # After Kickoff: promote an accepted draft
+    # --------------------------------
+    @after_kickoff
+    def finalize_output(self, result: CrewOutput) -> CrewOutput:
+        """
+        When the refinement step was skipped, the crew's last output is the
+        construction draft; expose it in the PromptGenConfig shape instead.
+        """
+        if isinstance(result.pydantic, DraftPrompt):
+            final = PromptGenConfig(final_prompt=result.pydantic.draftPrompt, notes=[])
+            result.pydantic = final
+            result.json_dict = final.model_dump()
+            result.raw = final.model_dump_json()
+        return result
+
+    def draft_needs_refinement(self, output: TaskOutput) -> bool:
+        """
+        The refinement LLM call only runs if the construction answer did not
+        validate as DraftPrompt, or the draft fails `validation.draft_is_complete`.
+        """
+        if not isinstance(output.pydantic, DraftPrompt):
+            return True
+        return not draft_is_complete(output.pydantic.draftPrompt, self.inputs)
+
     # --------------------------------
     # Agents
+    # (plan-stage agents are CachedAgents: their output only depends on the rendered prompt)
     # --------------------------------
 
     @agent
     def domain_breakdown_agent(self) -> Agent:
-        return Agent(
+        return CachedAgent(
             role="Domain Breakdown Analyzer for {domain}",
             goal=(
                 "Take the user's problem statement and precisely break it down in the context of {domain}. "
@@ -55,19 +313,12 @@ class PromptGenCrew:
                 "Extract key points, constraints, or focus areas unique to {domain}."
             ),
             llm=self.llm,
-            memory=True,
-            verbose=False,
-            allow_delegation=False,
-            max_iter=3,
-            respect_context_window=True,
-            use_system_prompt=True,
-            cache=False,
-            max_retry_limit=2
+            **_AGENT_DEFAULTS
         )
 
     @agent
     def input_analysis_agent(self) -> Agent:
-        return Agent(
+        return CachedAgent(
             role="Input Analysis Agent in {domain}",
             goal=(
                 "Examine and interpret the input placeholders and output context, factoring in the domain breakdown "
@@ -77,35 +328,24 @@ class PromptGenCrew:
                 "An agent that takes the domain breakdown and applies it to the user's placeholders, understanding how "
                 "they should be used given the problem statement and domain specifics."
             ),
-            llm=self.llm,
-            memory=True,
-            verbose=False,
-            allow_delegation=False,
-            max_iter=3,
-            respect_context_window=True,
-            use_system_prompt=True,
-            cache=False,
-            max_retry_limit=2
+            llm=self.cheap_llm,
+            **_AGENT_DEFAULTS
         )
 
     @agent
     def schema_inference_agent(self) -> Agent:
-        return Agent(
+        return CachedAgent(
             role="Schema Inference Expert for {domain}",
             goal="Confirm or infer a final output schema (e.g. markdown, JSON) appropriate to {domain} and the user's requirements.",
             backstory=(
                 "Ensures the final output schema is not optional, referencing {domain} best practices "
                 "and any user-provided output_schema. If not provided, choose an appropriate default."
             ),
-            llm=self.llm,
-            memory=True,
-            verbose=False,
-            allow_delegation=False,
-            max_iter=3,
-            respect_context_window=True,
-            use_system_prompt=True,
-            cache=False,
-            max_retry_limit=2
+            llm=self.cheap_llm,
+            # Its only per-request value is output_schema (the role fixes {domain}), so a
+            # near-identical match would confirm a different schema: exact matches only.
+            semantic_match=False,
+            **_AGENT_DEFAULTS
         )
 
     @agent
@@ -117,14 +357,7 @@ class PromptGenCrew:
                 "An expert prompter that weaves the domain context (header), placeholders usage (body), and mandatory schema instructions (footer) into one text."
             ),
             llm=self.llm,
-            memory=True,
-            verbose=False,
-            allow_delegation=False,
-            max_iter=3,
-            respect_context_window=True,
-            use_system_prompt=True,
-            cache=False,
-            max_retry_limit=2
+            **_AGENT_DEFAULTS
         )
 
     @agent
@@ -136,15 +369,8 @@ class PromptGenCrew:
                 "A meticulous editor who checks that the final prompt is well-structured, references {domain} properly, "
                 "and enforces the output schema instructions."
             ),
-            llm=self.llm,
-            memory=True,
-            verbose=False,
-            allow_delegation=False,
-            max_iter=3,
-            respect_context_window=True,
-            use_system_prompt=True,
-            cache=False,
-            max_retry_limit=2
+            llm=self.cheap_llm,
+            **_AGENT_DEFAULTS
         )
 
     # --------------------------------
@@ -156,104 +382,44 @@ class PromptGenCrew:
         """
         STEP 1 (Plan): Break down the problem statement in context of {domain}.
         """
-        description = r"""
-Problem Statement: {problem_statement}
-Domain: {domain}
-
-**INSTRUCTIONS**:
-1. Analyze the user's problem statement, focusing on the {domain}-specific aspects.
-2. Identify any nuances or constraints that the {domain} imposes on this problem.
-3. Return strictly JSON of the form:
-   {{
-     "domain_key_points": [
-       "... bullet points or short lines about how {domain} shapes the problem statement ..."
-     ],
-     "relevant_goals": [
-       "... derived or restated objectives from problem_statement in domain context ..."
-     ]
-   }}
-
-No extra commentary.
-"""
         return Task(
-            description=description,
+            description=_DESC_DOMAIN_BREAKDOWN,
             expected_output='{"domain_key_points":[],"relevant_goals":[]}',
-            agent=self.domain_breakdown_agent()
+            agent=self.domain_breakdown_agent(),
+            output_pydantic=DomainBreakdown,
+            callback=_compact_output({"domain_key_points", "relevant_goals"}),
+            async_execution=True
         )
 
     @task
-    def input_analysis_task(self) -> Task:
+    def schema_inference_task(self) -> Task:
         """
-        STEP 2 (Plan): Understand placeholders & output context in light of the domain breakdown.
+        STEP 2 (Plan): Determine or confirm the final output schema.
+        Only depends on the raw inputs, so it runs concurrently with the domain breakdown.
         """
-        description = r"""
-We have the domain breakdown:
-{{output from domain_breakdown_task}}
-
-We also have:
-- Placeholders: {input_placeholders}
-- Output Context: {output_context}
-
-**INSTRUCTIONS**:
-1. For each placeholder, if it has a colon (e.g. "<<title: The product name>>"), split into:
-   - name: "<<title>>"
-   - description: "The product name"
-   Otherwise, leave description blank.
-2. Reflect on how each placeholder or the output context aligns with the domain breakdown. 
-   For example: "Placeholder <<features>> might describe product attributes, relevant in {domain} because..."
-3. Return strictly JSON:
-   {{
-     "decoded_placeholders": [
-       {{
-         "name": "<<placeholderName>>",
-         "description": "Optional or empty"
-       }},
-       ...
-     ],
-     "context_analysis": [
-       "... bullet points about how {output_context} fits {domain} or the problem statement ..."
-     ]
-   }}
-
-No extra commentary outside the JSON.
-"""
         return Task(
-            description=description,
-            expected_output='{"decoded_placeholders":[],"context_analysis":[]}',
-            agent=self.input_analysis_agent(),
-            context=[self.domain_breakdown_task()]
+            description=_DESC_SCHEMA_INFERENCE,
+            expected_output='{"final_schema":"","schema_details":[]}',
+            agent=self.schema_inference_agent(),
+            output_pydantic=SchemaInference,
+            # prompt construction only needs the schema itself, not the reasoning details
+            callback=_compact_output({"final_schema"}),
+            async_execution=True
         )
 
     @task
-    def schema_inference_task(self) -> Task:
+    def input_analysis_task(self) -> Task:
         """
-        STEP 3 (Plan): Determine or confirm the final output schema.
+        STEP 3 (Plan): Understand placeholders & output context in light of the domain breakdown.
+        Waits on both concurrent plan tasks before running.
         """
-        description = r"""
-We have domain breakdown and input analysis:
-{{output from input_analysis_task}}
-
-Also, user-supplied (or empty) 'output_schema': {output_schema}.
-
-**INSTRUCTIONS**:
-1. If 'output_schema' is specified and valid, confirm it as final_schema.
-2. If it's empty, propose one that fits the {domain} and the above context_analysis.
-3. Return JSON:
-   {{
-     "final_schema": "e.g. markdown or json",
-     "schema_details": [
-       "... details on how to implement that schema ...",
-       "... e.g. bullet points, headings, JSON keys, etc. ..."
-     ]
-   }}
-
-No extra commentary.
-"""
         return Task(
-            description=description,
-            expected_output='{"final_schema":"","schema_details":[]}',
-            agent=self.schema_inference_agent(),
-            context=[self.input_analysis_task()]
+            description=_DESC_INPUT_ANALYSIS,
+            expected_output='{"context_analysis":[]}',
+            agent=self.input_analysis_agent(),
+            output_pydantic=InputAnalysis,
+            callback=_compact_output({"context_analysis"}),
+            context=[self.domain_breakdown_task()]
         )
 
     # --------------------------------
@@ -265,59 +431,31 @@ No extra commentary.
         """
         STEP 4 (Execution): Create a cohesive prompt template (header/body/footer).
         """
-        description = r"""
-We have:
-- Domain breakdown: {{output from domain_breakdown_task}}
-- Placeholders & context analysis: {{output from input_analysis_task}}
-- Schema inference: {{output from schema_inference_task}}
-
-**INSTRUCTIONS**:
-1. Build a single prompt template text with:
-   - A header referencing {domain} context or role (based on "domain_key_points" / "relevant_goals").
-   - A body describing how to use each placeholder from "decoded_placeholders" in a meaningful way.
-   - A footer with explicit instructions about the "final_schema". This schema is mandatory.
-
-2. Return strictly JSON:
-   {{
-     "draftPrompt": "...(the entire prompt template text)..."
-   }}
-
-No commentary beyond JSON.
-"""
         return Task(
-            description=description,
+            description=_DESC_PROMPT_CONSTRUCTION,
             expected_output='{"draftPrompt": "..."}',
             agent=self.prompt_construction_agent(),
-            context=[self.schema_inference_task()]
+            output_pydantic=DraftPrompt,
+            context=[
+                self.domain_breakdown_task(),
+                self.input_analysis_task(),
+                self.schema_inference_task()
+            ]
         )
 
     @task
     def prompt_refinement_task(self) -> Task:
         """
         STEP 5 (Execution): Refine the final prompt template, ensuring placeholders & schema usage are mandatory.
+        Conditional: only runs when the draft fails `draft_needs_refinement`.
         """
-        description = r"""
-We have a draft prompt:
-{{output}}
-
-**INSTRUCTIONS**:
-1. Refine & finalize the prompt text. Keep placeholders intact (e.g. <<title>>).
-2. Ensure references to {domain} remain consistent.
-3. The schema instructions must be mandatory (remove optional language if present).
-4. Return strictly JSON:
-   {{
-     "final_prompt": "...(the refined final prompt text)...",
-     "notes": []
-   }}
-
-No commentary or extra fields.
-"""
-        return Task(
-            description=description,
+        return ConditionalTask(
+            description=_DESC_PROMPT_REFINEMENT,
             expected_output='{"final_prompt":"...","notes":[]}',
             agent=self.prompt_refinement_agent(),
             context=[self.prompt_construction_task()],
-            output_pydantic=PromptGenConfig
+            output_pydantic=PromptGenConfig,
+            condition=self.draft_needs_refinement
         )
 
     # --------------------------------
@@ -330,32 +468,65 @@ No commentary or extra fields.
         The pipeline is organized in 5 tasks across 2 stages:
 
         --- PLAN STAGE ---
-        1) domain_breakdown_task (domain_breakdown_agent)
-        2) input_analysis_task (input_analysis_agent)
-        3) schema_inference_task (schema_inference_agent)
+        1) domain_breakdown_task (domain_breakdown_agent)  [async]
+        2) schema_inference_task (schema_inference_agent)  [async]
+        3) input_analysis_task (input_analysis_agent)      waits on 1) and 2)
 
         --- EXECUTION STAGE ---
         4) prompt_construction_task (prompt_construction_agent)
-        5) prompt_refinement_task (prompt_refinement_agent)
+        5) prompt_refinement_task (prompt_refinement_agent)  [conditional]
         """
         return Crew(
             agents=[
                 self.domain_breakdown_agent(),
-                self.input_analysis_agent(),
                 self.schema_inference_agent(),
+                self.input_analysis_agent(),
                 self.prompt_construction_agent(),
                 self.prompt_refinement_agent()
             ],
             tasks=[
-                # Plan Stage
+                # Plan Stage (1 and 2 run concurrently)
                 self.domain_breakdown_task(),
-                self.input_analysis_task(),
                 self.schema_inference_task(),
+                self.input_analysis_task(),
 
                 # Execution Stage
                 self.prompt_construction_task(),
                 self.prompt_refinement_task()
             ],
             process=Process.sequential,
-            verbose=True
+            # Verbose output pretty-prints every task result; opt in with CREW_VERBOSE=1.
+            verbose=os.getenv("CREW_VERBOSE", "0") == "1"
         )
+
+
+# --------------------------------
+# Crew reuse across requests
+# --------------------------------
+
+_crew_pool: "queue.SimpleQueue[PromptGenCrew]" = queue.SimpleQueue()
+
+
+@contextmanager
+def pooled_crew() -> Iterator[PromptGenCrew]:
+    """
+    Checks out an idle PromptGenCrew (building one only if none is free) and
+    returns it to the pool afterwards, so the agents/tasks/crew graph is built
+    once per concurrent slot rather than once per request.
+
+    A single shared instance is not safe here: kickoff() writes task outputs and
+    `self.inputs` onto the objects, so each instance serves one request at a time.
+    Instances whose run raised are dropped rather than reused.
+
+    Agents count failed attempts in `_times_executed` and never reset it, so the
+    count is cleared on checkout; otherwise a reused agent would run out of
+    retries after a few transient failures spread over many requests.
+    """
+    try:
+        instance = _crew_pool.get_nowait()
+        for pooled_agent in instance.crew().agents:
+            pooled_agent._times_executed = 0
+    except queue.Empty:
+        instance = PromptGenCrew()
+    yield instance
+    _crew_pool.put(instance)
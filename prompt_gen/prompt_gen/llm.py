@@ -0,0 +1,72 @@
+# src/prompt_gen/llm.py
+
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Callable, Optional
+import httpx
+import litellm
+from crewai import LLM
+from crewai.utilities.events import LLMStreamChunkEvent, crewai_event_bus
+from crewai.utilities.events.event_listener import event_listener  # noqa: F401  (registers CrewAI's default handlers first)
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Task descriptions are laid out as: static instructions, then this marker,
+# then the per-request values, so the prompt text before the marker is identical
+# across requests. That only lets providers with automatic prefix caching reuse it
+# once the shared prefix (with CrewAI's agent/system text) passes their minimum
+# cacheable length (1024 tokens for OpenAI); no explicit cache_control is sent.
+REQUEST_MARKER = "**REQUEST**:"
+
+# Per-request receiver for streamed completion text. Set it in the request's context
+# before kickoff (kickoff_async carries it into the crew's worker thread); only
+# LLMs built with streaming=True feed it, and the crew only uses one of those
+# when a sink is set.
+stream_sink: ContextVar[Optional[Callable[[str], None]]] = ContextVar("stream_sink", default=None)
+
+
+def _forward_stream_chunk(source: Any, event: LLMStreamChunkEvent) -> None:
+    # Emitted synchronously from the thread making the LLM call, so the
+    # request's stream_sink is visible here.
+    sink = stream_sink.get()
+    if sink is not None:
+        sink(event.chunk)
+
+
+# Replaces CrewAI's default chunk handler, which prints every chunk to stdout
+# and appends it to a process-wide StringIO that is never cleared.
+crewai_event_bus._handlers[LLMStreamChunkEvent] = [_forward_stream_chunk]
+
+
+# --------------------------------
+# Shared clients / LLM instances
+# --------------------------------
+
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=64, keepalive_expiry=300)
+
+
+def configure_http_clients() -> None:
+    """
+    Installs process-wide keep-alive httpx clients for LiteLLM (HTTP/2 when `h2`
+    is installed), so every LLM call reuses pooled connections instead of paying
+    TCP + TLS setup. Leaves clients configured elsewhere untouched.
+    """
+    if litellm.client_session is None:
+        litellm.client_session = httpx.Client(http2=HTTP2_AVAILABLE, limits=HTTP_LIMITS)
+    if litellm.aclient_session is None:
+        litellm.aclient_session = httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=HTTP_LIMITS)
+
+
+@lru_cache(maxsize=None)
+def shared_llm(model: str, temperature: float = 0.2, streaming: bool = False) -> LLM:
+    """
+    One LLM per (model, temperature, streaming) for the whole process,
+    shared by every agent of every pooled crew. Streaming LLMs emit CrewAI's
+    LLMStreamChunkEvent per chunk, which is forwarded to the request's stream_sink.
+    """
+    configure_http_clients()
+    return LLM(model=model, temperature=temperature, verbose=False, stream=streaming)
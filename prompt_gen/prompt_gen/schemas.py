@@ -1,5 +1,5 @@
 # src/prompt_gen/schemas.py
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional
 
 class PromptGenInput(BaseModel):
@@ -7,12 +7,40 @@ class PromptGenInput(BaseModel):
     The request body for POST /prompt-gen/create_prompt
     describing user-provided context.
     """
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=False)
+
     problem_statement: str
     domain: str
     input_placeholders: List[str]
     output_context: str
     output_schema: Optional[str] = None
 
+class DomainBreakdown(BaseModel):
+    """
+    Output of the domain breakdown task (plan stage).
+    """
+    domain_key_points: List[str] = []
+    relevant_goals: List[str] = []
+
+class SchemaInference(BaseModel):
+    """
+    Output of the schema inference task (plan stage).
+    """
+    final_schema: str
+    schema_details: List[str] = []
+
+class InputAnalysis(BaseModel):
+    """
+    Output of the input analysis task (plan stage).
+    """
+    context_analysis: List[str] = []
+
+class DraftPrompt(BaseModel):
+    """
+    Output of the prompt construction task (execution stage).
+    """
+    draftPrompt: str
+
 class PromptGenConfig(BaseModel):
     """
     The final output from the last task in the agentic flow,
@@ -20,3 +48,12 @@ class PromptGenConfig(BaseModel):
     """
     final_prompt: str
     notes: Optional[List[str]] = []
+
+class PromptGenResponse(BaseModel):
+    """
+    The response body of POST /prompt-gen/create_prompt
+    (and the last line of /create_prompt/stream on success).
+    """
+    status: str = "success"
+    final_prompt: str
+    notes: List[str] = []
@@ -0,0 +1,56 @@
+# src/prompt_gen/validation.py
+
+import re
+from typing import Any, Dict, List
+
+# "<<title: The product name>>" -> name "title", description "The product name"
+_PLACEHOLDER_RE = re.compile(r"<<([^:>]+)(?::\s*(.*?))?>>")
+
+
+def decode_placeholders(placeholders: List[str]) -> List[Dict[str, str]]:
+    """
+    Splits each "<<name: description>>" placeholder into
+    {"name": "<<name>>", "description": "description"} (description "" if absent).
+    """
+    decoded = []
+    for placeholder in placeholders:
+        match = _PLACEHOLDER_RE.match(placeholder.strip())
+        if match:
+            decoded.append({
+                "name": f"<<{match.group(1).strip()}>>",
+                "description": (match.group(2) or "").strip()
+            })
+        else:
+            decoded.append({"name": placeholder.strip(), "description": ""})
+    return decoded
+
+
+def placeholder_names(placeholders: List[str]) -> List[str]:
+    """
+    The bare placeholder tokens a prompt must contain, e.g. ["<<title>>", ...].
+    """
+    return [placeholder["name"] for placeholder in decode_placeholders(placeholders)]
+
+
+def draft_is_complete(draft: str, inputs: Dict[str, Any]) -> bool:
+    """
+    Deterministic structural check of a construction draft against the request:
+    - the draft is non-empty,
+    - every input placeholder (<<name>>) survived,
+    - the schema is declared mandatory (and the user's output_schema is named).
+    """
+    if not draft.strip():
+        return False
+
+    placeholders = inputs.get("input_placeholders") or []
+    if any(name not in draft for name in placeholder_names(placeholders)):
+        return False
+
+    if "mandatory" not in draft.lower():
+        return False
+
+    output_schema = inputs.get("output_schema")
+    if output_schema and output_schema not in draft:
+        return False
+
+    return True
@@ -0,0 +1,189 @@
+import threading
+
+from prompt_gen import cache as cache_module
+from prompt_gen.cache import ResponseCache
+
+
+def test_get_or_compute_caches_by_normalized_text():
+    cache = ResponseCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return "answer"
+
+    assert cache.get_or_compute("role", "a  prompt\n", compute) == "answer"
+    assert cache.get_or_compute("role", "a prompt", compute) == "answer"
+    assert len(calls) == 1
+    assert cache.get("other role", "a prompt") is None
+
+
+class _Vector:
+    """Stand-in for a normalized embedding: equal texts score 1.0, others 0.0."""
+
+    def __init__(self, text):
+        self.text = text
+
+    def __matmul__(self, other):
+        return 1.0 if self.text == other.text else 0.0
+
+
+def _semantic_cache(embedded):
+    cache = ResponseCache()
+
+    def embed(text):
+        embedded.append(text)
+        return _Vector(text)
+
+    cache._embed = embed
+    return cache
+
+
+def test_semantic_match_compares_only_semantic_text():
+    embedded = []
+    cache = _semantic_cache(embedded)
+    cache.set("role", "static instructions v1 + request", "answer", semantic_text="request")
+
+    assert cache.get("role", "static instructions v2 + request", semantic_text="request") == "answer"
+    assert cache.get("role", "static instructions v2 + request", semantic_text="other") is None
+    assert embedded == ["request", "request", "other"]
+
+
+def test_semantic_match_skipped_without_semantic_text():
+    embedded = []
+    cache = _semantic_cache(embedded)
+    cache.set("role", "prompt with context A", "answer")
+
+    assert cache.get("role", "prompt with context B") is None
+    assert embedded == []
+
+
+def test_concurrent_calls_for_same_key_are_coalesced():
+    cache = ResponseCache()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return "answer"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_compute("role", "prompt", compute)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ["answer"] * 5
+    assert len(calls) == 1
+
+
+def test_reentrant_retry_does_not_deadlock():
+    # CrewAI's Agent.execute_task retries by calling execute_task again, which
+    # re-enters get_or_compute for the same key from inside `compute`.
+    cache = ResponseCache(wait_timeout=5)
+    attempts = []
+
+    def execute_task():
+        return cache.get_or_compute("role", "prompt", attempt)
+
+    def attempt():
+        attempts.append(1)
+        if len(attempts) == 1:
+            return execute_task()  # the "retry"
+        return "answer"
+
+    result = []
+    thread = threading.Thread(target=lambda: result.append(execute_task()))
+    thread.start()
+    thread.join(2)
+
+    assert not thread.is_alive()
+    assert result == ["answer"]
+    assert cache.get("role", "prompt") == "answer"
+
+
+def test_failed_leader_releases_waiters():
+    cache = ResponseCache(wait_timeout=5)
+    leader_started = threading.Event()
+    release = threading.Event()
+
+    def failing():
+        leader_started.set()
+        release.wait(5)
+        raise RuntimeError("LLM failed")
+
+    def leader():
+        try:
+            cache.get_or_compute("role", "prompt", failing)
+        except RuntimeError:
+            pass
+
+    leader_thread = threading.Thread(target=leader)
+    leader_thread.start()
+    leader_started.wait(5)
+
+    result = []
+    waiter = threading.Thread(target=lambda: result.append(cache.get_or_compute("role", "prompt", lambda: "answer")))
+    waiter.start()
+    release.set()
+    leader_thread.join(5)
+    waiter.join(5)
+
+    assert result == ["answer"]
+
+
+def test_waiter_times_out_and_computes_itself():
+    cache = ResponseCache(wait_timeout=0.05)
+    release = threading.Event()
+
+    leader = threading.Thread(target=lambda: cache.get_or_compute("role", "prompt", lambda: release.wait(5) and "slow"))
+    leader.start()
+    try:
+        assert cache.get_or_compute("role", "prompt", lambda: "fast") == "fast"
+    finally:
+        release.set()
+        leader.join(5)
+
+
+def test_invalid_answers_are_returned_but_not_stored():
+    cache = ResponseCache()
+    answers = iter(["I could not determine a schema.", '{"final_schema": "markdown"}'])
+
+    def is_json(answer):
+        return answer.startswith("{")
+
+    first = cache.get_or_compute("role", "prompt", lambda: next(answers), validate=is_json)
+    assert first == "I could not determine a schema."
+    assert cache.get("role", "prompt") is None
+
+    second = cache.get_or_compute("role", "prompt", lambda: next(answers), validate=is_json)
+    assert second == '{"final_schema": "markdown"}'
+    assert cache.get("role", "prompt") == second
+
+
+def test_embedding_model_failure_falls_back_to_exact_matching(monkeypatch):
+    loads = []
+
+    def unavailable(model_name):
+        loads.append(model_name)
+        raise OSError("model hub unreachable")
+
+    monkeypatch.setattr(cache_module, "SentenceTransformer", unavailable)
+    cache = ResponseCache()
+
+    assert cache.get_or_compute("role", "prompt", lambda: "answer", semantic_text="request") == "answer"
+    assert cache.get("role", "prompt", semantic_text="request") == "answer"
+    assert cache.get("role", "other prompt", semantic_text="request") is None
+    assert len(loads) == 1
+
+
+def test_persistent_key_includes_cache_version(monkeypatch):
+    digest = ResponseCache._digest(("role", "prompt"))
+    monkeypatch.setattr(cache_module, "CACHE_VERSION", "2")
+    assert ResponseCache._digest(("role", "prompt")) != digest
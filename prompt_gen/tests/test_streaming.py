@@ -0,0 +1,43 @@
+import pytest
+
+from prompt_gen.api.streaming import FinalPromptExtractor
+
+
+def _feed_all(chunks):
+    extractor = FinalPromptExtractor()
+    return "".join(extractor.feed(chunk) for chunk in chunks)
+
+
+def test_extracts_value_after_preamble():
+    answer = 'Thought: done\n{"final_prompt": "Hello <<name>>", "notes": ["x"]}'
+    assert _feed_all([answer]) == "Hello <<name>>"
+
+
+def test_key_and_escapes_split_across_chunks():
+    answer = 'Thought: ok {"final_pro' + 'mpt" : "line\\' + 'nquote \\"q\\" \\u00' + 'e9 end", "notes": []}'
+    chunks = [answer[i:i + 3] for i in range(0, len(answer), 3)]
+    assert _feed_all(chunks) == 'line\nquote "q" é end'
+
+
+def test_surrogate_pair_split_across_chunks():
+    assert _feed_all(['{"final_prompt": "a \\ud83d', '\\ude00 b"}']) == "a \U0001F600 b"
+
+
+def test_returns_nothing_after_value_ends():
+    extractor = FinalPromptExtractor()
+    assert extractor.feed('{"final_prompt": "done"') == "done"
+    assert extractor.feed(', "final_prompt": "again"}') == ""
+
+
+def test_malformed_unicode_escape_raises_value_error():
+    extractor = FinalPromptExtractor()
+    with pytest.raises(ValueError):
+        extractor.feed('{"final_prompt": "bad \\uZZZZ"}')
+
+
+def test_unpaired_surrogate_raises_value_error():
+    extractor = FinalPromptExtractor()
+    with pytest.raises(ValueError):
+        extractor.feed('{"final_prompt": "bad \\ud83d and more text"}')
+    with pytest.raises(ValueError):
+        FinalPromptExtractor().feed('{"final_prompt": "bad \\ude00 low"}')
@@ -0,0 +1,56 @@
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("crewai")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from prompt_gen.api.routers import prompt
+
+_VALID = {
+    "problem_statement": "Summarize product reviews",
+    "domain": "e-commerce",
+    "input_placeholders": ["<<reviews: The raw reviews>>"],
+    "output_context": "A short summary",
+    "output_schema": "markdown",
+}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    async def no_crew(input):
+        raise AssertionError("invalid input reached the crew")
+
+    monkeypatch.setattr(prompt, "_run_crew", no_crew)
+    app = FastAPI()
+    app.include_router(prompt.trusted_router, prefix="/prompt-gen")
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("overrides", [
+    {"problem_statement": None},
+    {"domain": 5},
+    {"output_context": ["not", "a", "string"]},
+    {"output_schema": 5},
+    {"output_schema": {"type": "object"}},
+    {"input_placeholders": "<<reviews>>"},
+    {"input_placeholders": ["<<reviews>>", 3]},
+])
+def test_rejects_wrong_types_with_422(client, overrides):
+    response = client.post("/prompt-gen/create_prompt/trusted", json={**_VALID, **overrides})
+    assert response.status_code == 422
+
+
+def test_accepts_missing_output_schema(client, monkeypatch):
+    seen = []
+
+    async def fake_crew(input):
+        seen.append(input)
+        raise RuntimeError("stop after validation")
+
+    monkeypatch.setattr(prompt, "_run_crew", fake_crew)
+    payload = {key: value for key, value in _VALID.items() if key != "output_schema"}
+    with pytest.raises(RuntimeError):
+        client.post("/prompt-gen/create_prompt/trusted", json=payload)
+    assert seen[0].domain == "e-commerce"
@@ -0,0 +1,41 @@
+from prompt_gen.validation import decode_placeholders, draft_is_complete, placeholder_names
+
+
+def test_decode_placeholders_splits_name_and_description():
+    assert decode_placeholders(["<<title: The product name>>", " <<price>> ", "plain"]) == [
+        {"name": "<<title>>", "description": "The product name"},
+        {"name": "<<price>>", "description": ""},
+        {"name": "plain", "description": ""},
+    ]
+
+
+def test_placeholder_names():
+    assert placeholder_names(["<<title: The product name>>", "<<price>>"]) == ["<<title>>", "<<price>>"]
+
+
+_INPUTS = {"input_placeholders": ["<<title: The product name>>"], "output_schema": "markdown"}
+
+
+def test_complete_draft():
+    draft = "Describe <<title>>. The markdown output format is mandatory."
+    assert draft_is_complete(draft, _INPUTS)
+
+
+def test_draft_missing_placeholder():
+    assert not draft_is_complete("Describe it. The markdown output format is mandatory.", _INPUTS)
+
+
+def test_draft_without_mandatory_schema():
+    assert not draft_is_complete("Describe <<title>>. Markdown output is optional.", _INPUTS)
+
+
+def test_draft_not_naming_output_schema():
+    assert not draft_is_complete("Describe <<title>>. The JSON format is mandatory.", _INPUTS)
+
+
+def test_empty_draft():
+    assert not draft_is_complete("  ", {})
+
+
+def test_draft_without_placeholders_or_schema():
+    assert draft_is_complete("Answer the question. The format is mandatory.", {"output_schema": ""})